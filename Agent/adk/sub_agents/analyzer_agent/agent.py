@@ -1,12 +1,12 @@
 from google.adk import Agent
-from google.adk.models.lite_llm import LiteLlm
 
 import config
+from adk.sub_agents.llm import get_llm
 
 
 def get_analyzer_agent():
     root_agent = Agent(
-        model=LiteLlm(model=config.model),
+        model=get_llm(),
         name='analyzer_assistant',
         description=config.analyzer_agent_description,
         instruction=config.analyzer_agent_instruction,
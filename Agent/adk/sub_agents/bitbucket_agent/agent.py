@@ -1,13 +1,20 @@
+import logging
 import os
 
-from dotenv import load_dotenv
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.tools.mcp_tool import MCPToolset
 from mcp import StdioServerParameters
 import config
+from adk.sub_agents.docker_images import ensure_image
+from adk.tools.mcp_pool import acquire_mcp_server
+from adk.sub_agents.env import load_env
+from adk.sub_agents.llm import get_llm
+
+load_env()
+
+logger = logging.getLogger(__name__)
+
+DOCKER_IMAGE = "mcp-bitbucket"
 
-load_dotenv()
 
 async def get_bitbucket_tool_async():
     """tool is bitbucket mcp server.
@@ -18,35 +25,38 @@ async def get_bitbucket_tool_async():
               tools: list of tools
               exit_stack: exit stack for cleanup
        """
-    print(f"--- Tool: Bitbucket ---")
+    logger.info("--- Tool: Bitbucket ---")
 
     # MCP server run as a docker container
+    await ensure_image(DOCKER_IMAGE)
+
     server_params = StdioServerParameters(
         command= "docker",
         args= [
             "run",
             "--rm",
             "-i",
-            "mcp-bitbucket",
+            # The image is prepared by ensure_image, so docker run never checks the registry
+            "--pull=never",
+            DOCKER_IMAGE,
             "--username",os.getenv("BITBUCKET_USERNAME"),
             "--app-password", os.getenv("BITBUCKET_PASSWORD")
         ]
     )
 
-    tools, exit_stack = await MCPToolset.from_server(
-        connection_params=server_params
-    )
+    # Repeated calls in this process share one running container
+    tools, exit_stack = await acquire_mcp_server(server_params)
 
-    print("MCP Toolset created successfully.")
+    logger.info("MCP Toolset created successfully.")
     return tools, exit_stack
 
 
 async def get_bitbucket_agent_async():
     tools, exit_stack = await get_bitbucket_tool_async()
-    print(f"Fetched {len(tools)} tools from bitbucket MCP server.")
+    logger.info(f"Fetched {len(tools)} tools from bitbucket MCP server.")
 
     bitbucket_agent = Agent(
-        model=LiteLlm(model=config.model),
+        model=get_llm(),
         name='bitbucket_assistant',
         description=config.bitbucket_agent_description,
         instruction=config.bitbucket_agent_instruction,
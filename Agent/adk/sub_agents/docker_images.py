@@ -0,0 +1,55 @@
+import asyncio
+import functools
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# One preparation task per image, shared by every caller in this process
+_image_tasks: Dict[str, asyncio.Task] = {}
+
+
+async def _prepare_image(image: str):
+    """Make sure the image is available locally, pulling it only when it is missing."""
+    proc = await asyncio.create_subprocess_exec(
+        "docker", "image", "inspect", image,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    if await proc.wait() == 0:
+        return
+
+    logger.info(f"Pulling docker image {image}...")
+    proc = await asyncio.create_subprocess_exec(
+        "docker", "pull", image,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"Failed to pull docker image {image}: {stderr.decode().strip()}")
+
+
+def _image_task_done(image: str, task: asyncio.Task):
+    """Forget a failed preparation so the next caller retries it, logging why it failed."""
+    if not task.cancelled() and task.exception() is None:
+        return
+    if _image_tasks.get(image) is task:
+        del _image_tasks[image]
+    # Retrieving the exception here also keeps asyncio from warning about a prefetch nobody awaited
+    if not task.cancelled():
+        logger.error(f"Preparing docker image {image} failed: {task.exception()}")
+
+
+def prefetch_images(*images: str):
+    """Start preparing the given images in the background, before any agent needs them."""
+    for image in images:
+        if image not in _image_tasks:
+            task = _image_tasks[image] = asyncio.create_task(_prepare_image(image))
+            task.add_done_callback(functools.partial(_image_task_done, image))
+
+
+async def ensure_image(image: str):
+    """Wait until the image is available locally, joining a prefetch that is already running."""
+    prefetch_images(image)
+    await _image_tasks[image]
@@ -1,13 +1,20 @@
 
+import logging
 import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.tools.mcp_tool import MCPToolset
 from mcp import StdioServerParameters
 import config
+from adk.sub_agents.docker_images import ensure_image
+from adk.tools.mcp_pool import acquire_mcp_server
+from adk.sub_agents.env import load_env
+from adk.sub_agents.llm import get_llm
+
+load_env()
+
+logger = logging.getLogger(__name__)
+
+DOCKER_IMAGE = "mcp-elasticsearch"
 
-load_dotenv()
 
 # Elasticsearch MCP Tool
 async def get_elasticsearch_tool_async():
@@ -19,7 +26,9 @@ async def get_elasticsearch_tool_async():
               tools: list of tools
               exit_stack: exit stack for cleanup
        """
-    print(f"--- Tool: Elasticsearch ---")
+    logger.info("--- Tool: Elasticsearch ---")
+
+    await ensure_image(DOCKER_IMAGE)
 
     server_params = StdioServerParameters(
         command= "docker",
@@ -27,25 +36,26 @@ async def get_elasticsearch_tool_async():
             "run",
             "--rm",
             "-i",
-            "mcp-elasticsearch",
+            # The image is prepared by ensure_image, so docker run never checks the registry
+            "--pull=never",
+            DOCKER_IMAGE,
             "--es-url", os.getenv("ES_URL"),
             "--ignore-cert-errors"
         ]
     )
 
-    tools, exit_stack = await MCPToolset.from_server(
-        connection_params=server_params
-    )
+    # Repeated calls in this process share one running container
+    tools, exit_stack = await acquire_mcp_server(server_params)
 
-    print("MCP Toolset created successfully.")
+    logger.info("MCP Toolset created successfully.")
     return tools, exit_stack
 
 async def get_elasticsearch_agent_async():
     tools, exit_stack = await get_elasticsearch_tool_async()
-    print(f"Fetched {len(tools)} tools from elasticSearch MCP server.")
+    logger.info(f"Fetched {len(tools)} tools from elasticSearch MCP server.")
 
     elasticsearch_agent = Agent(
-        model=LiteLlm(model=config.model),
+        model=get_llm(),
         name='elasticSearch_assistant',
         description=config.elasticsearch_agent_description,
         instruction=config.elasticsearch_agent_instruction,
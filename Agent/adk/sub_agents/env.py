@@ -0,0 +1,19 @@
+import functools
+import os
+
+from dotenv import find_dotenv, load_dotenv
+
+# The Agent directory (holding main.py and config.py), where the .env file lives
+_AGENT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> bool:
+    """
+    Load the .env file once per process without overriding variables that are already set.
+
+    DOTENV_PATH wins when set; otherwise the .env found from the working directory is used,
+    falling back to the one in the Agent directory so running from elsewhere still finds it.
+    """
+    dotenv_path = os.environ.get("DOTENV_PATH") or find_dotenv(usecwd=True) or os.path.join(_AGENT_DIR, ".env")
+    return load_dotenv(dotenv_path=dotenv_path, override=False)
@@ -0,0 +1,11 @@
+import functools
+
+from google.adk.models.lite_llm import LiteLlm
+
+import config
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm() -> LiteLlm:
+    """Return the model client shared by all sub-agents, so they reuse one HTTP connection pool."""
+    return LiteLlm(model=config.model)
@@ -1,37 +1,223 @@
 #!/usr/bin/env python3
+import asyncio
+import atexit
+import io
+import keyword
+import logging
+import logging.handlers
 import os
-import yaml
-import pathlib
-import mysql.connector
+import queue
+import re
+import sys
+import time
+import aiomysql
+import orjson
 from dotenv import load_dotenv
 from fastmcp import FastMCP
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+# This file runs as a standalone script, so its sibling modules are imported top-level
+from tools_config import CONFIG_FILE, load_tools_config
 
 load_dotenv()
 
+# stdout carries the MCP stdio protocol, so logs go to stderr. Records are queued and
+# written by a background listener thread, keeping the writes off the tool-call path.
+# Formatting happens once, in the listener thread, so the queue handler has no formatter.
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler(sys.stderr)
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.root.addHandler(logging.handlers.QueueHandler(_log_queue))
+logging.root.setLevel(logging.INFO)
+
+logger = logging.getLogger("mysql_agent_mcp")
+
 mcp = FastMCP(name="MySQLAgentServer")
 
-# MySQL connection function
-def get_mysql_connection():
-    return mysql.connector.connect(
-        host=os.getenv("MYSQL_HOST"),
-        user=os.getenv("MYSQL_USER"),
-        password=os.getenv("MYSQL_PASSWORD"),
-        database=os.getenv("MYSQL_DATABASE"),
-        port=int(os.getenv("MYSQL_PORT")),
-    )
+# MySQL connection pool, created on first use and shared by all tools
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_mysql_pool() -> aiomysql.Pool:
+    global _pool
+    if _pool is not None:
+        return _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await aiomysql.create_pool(
+                minsize=2,
+                maxsize=int(os.getenv("MYSQL_POOL_SIZE", "8")),
+                autocommit=True,
+                host=os.getenv("MYSQL_HOST"),
+                user=os.getenv("MYSQL_USER"),
+                password=os.getenv("MYSQL_PASSWORD"),
+                db=os.getenv("MYSQL_DATABASE"),
+                port=int(os.getenv("MYSQL_PORT")),
+            )
+    return _pool
+
+
+# Rows are pulled from the server in batches of this size
+FETCH_BATCH_SIZE = 1000
+
+# Most rows run_query returns; the query itself is sent unchanged
+QUERY_ROW_LIMIT = int(os.getenv("MYSQL_QUERY_ROW_LIMIT", "10000"))
+
+_ORDER_BY_RE = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+
+
+async def fetch_result(cursor, max_rows: Optional[int] = None) -> str:
+    """
+    Serialize the cursor's result set as a JSON list of row objects, batch by batch.
+
+    With max_rows set, at most that many rows are returned. If the result set has more, the
+    list is wrapped as {"rows": [...], "truncated": true, "row_limit": max_rows} so the caller
+    can tell. The unbuffered cursor still reads the remaining rows off the connection when it
+    is closed; they are discarded without being held in memory, but the server sends them all.
+    """
+    if cursor.description is None:
+        return "Query executed successfully."
+
+    columns = [column[0] for column in cursor.description]
+    out = io.BytesIO()
+    out.write(b"[")
+    separator = b""
+    remaining = max_rows
+    while remaining is None or remaining > 0:
+        rows = await cursor.fetchmany(FETCH_BATCH_SIZE if remaining is None else min(FETCH_BATCH_SIZE, remaining))
+        if not rows:
+            break
+        for row in rows:
+            out.write(separator)
+            out.write(orjson.dumps(dict(zip(columns, row)), default=str))
+            separator = b","
+        if remaining is not None:
+            remaining -= len(rows)
+    out.write(b"]")
+
+    if remaining == 0 and await cursor.fetchone() is not None:
+        return f'{{"rows":{out.getvalue().decode()},"truncated":true,"row_limit":{max_rows}}}'
+    return out.getvalue().decode()
+
+
+def serialize_rows(columns, rows) -> str:
+    """Serialize already fetched rows in the same format as fetch_result."""
+    return orjson.dumps([dict(zip(columns, row)) for row in rows], default=str).decode()
+
+
+# Concurrent calls of the same dynamic tool arriving within this window share one round-trip
+BATCH_WINDOW = float(os.getenv("MYSQL_BATCH_WINDOW_MS", "5")) / 1000
+
+
+class BatchingExecutor:
+    """
+    Coalesces concurrent executions of one SELECT statement.
+
+    Calls arriving within BATCH_WINDOW are combined into a single UNION ALL query, tagged with
+    the index of the call they belong to, and the rows are routed back to each caller. Other
+    statements and lone calls are executed one by one, and so is every call of a statement
+    whose batch the server rejected.
+    Set MYSQL_BATCH_WINDOW_MS=0 to disable batching.
+    """
+
+    def __init__(self, sql: str):
+        """
+        Initialize the executor.
+
+        Args:
+            sql: The compiled SQL statement, using %s placeholders
+        """
+        self.sql = sql.strip().rstrip(";").rstrip()
+        # Derived tables may drop their ORDER BY, so ordered statements are never batched
+        self.batchable = (
+            BATCH_WINDOW > 0
+            and self.sql[:6].upper() == "SELECT"
+            and not _ORDER_BY_RE.search(self.sql)
+        )
+        self._pending: List[Tuple[tuple, asyncio.Future]] = []
+        self._flush_task = None
+
+    async def execute(self, param_values: tuple) -> str:
+        """Execute the statement with the given parameter values and return the serialized result."""
+        if not self.batchable:
+            return await self._execute_one(param_values)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((param_values, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        await asyncio.sleep(BATCH_WINDOW)
+        pending, self._pending, self._flush_task = self._pending, [], None
+
+        try:
+            if len(pending) == 1:
+                results = [await self._execute_one(pending[0][0])]
+            else:
+                results = await self._execute_batch([param_values for param_values, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _execute_one(self, param_values: tuple) -> str:
+        pool = await get_mysql_pool()
+        async with pool.acquire() as conn, conn.cursor(aiomysql.SSCursor) as cursor:
+            await cursor.execute(self.sql, param_values)
+            return await fetch_result(cursor)
+
+    async def _execute_batch(self, batch: List[tuple]) -> List[Any]:
+        query = " UNION ALL ".join(
+            f"SELECT {index} AS _batch_index, _batch.* FROM ({self.sql}) AS _batch"
+            for index in range(len(batch))
+        )
+        args = tuple(value for param_values in batch for value in param_values)
+
+        try:
+            pool = await get_mysql_pool()
+            async with pool.acquire() as conn, conn.cursor() as cursor:
+                await cursor.execute(query, args)
+                columns = [column[0] for column in cursor.description[1:]]
+                rows = await cursor.fetchall()
+        except aiomysql.Error as e:
+            # e.g. the statement cannot be used as a derived table, or selects duplicate
+            # column names. Rewriting it again would fail the same way, so stop batching.
+            self.batchable = False
+            logger.warning(f"Batched execution failed, running calls individually from now on: {e}")
+            return list(await asyncio.gather(
+                *(self._execute_one(param_values) for param_values in batch),
+                return_exceptions=True,
+            ))
+
+        grouped: List[list] = [[] for _ in batch]
+        for row in rows:
+            grouped[row[0]].append(row[1:])
+        return [serialize_rows(columns, group_rows) for group_rows in grouped]
+
 
 # Load dynamic tools from YAML configuration
 def load_dynamic_tools_from_yaml():
     """Load dynamic tools from the YAML configuration file."""
-    # Path to the YAML configuration file
-    config_dir = pathlib.Path(__file__).parent.parent.parent
-    config_file = os.path.join(config_dir, "dynamic_tools", "mysql_tools.yaml")
-    print(f"Loading dynamic tools from: {config_file}")
+    logger.info(f"Loading dynamic tools from: {CONFIG_FILE}")
 
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_tools_config()
 
         # Load tools
         tools_config = config.get('tools', {})
@@ -41,9 +227,9 @@ def load_dynamic_tools_from_yaml():
             if tool_config.get('kind') == 'mysql-sql':
                 register_dynamic_tool(tool_name, tool_config)
 
-        print(f"Loaded {len(tools_config)} dynamic tools from YAML configuration")
+        logger.info(f"Loaded {len(tools_config)} dynamic tools from YAML configuration")
     except Exception as e:
-        print(f"Error loading dynamic tools: {e}")
+        logger.error(f"Error loading dynamic tools: {e}")
 
 def register_dynamic_tool(tool_name: str, tool_config: Dict[str, Any]):
     """Register a dynamic tool with the MCP server."""
@@ -56,53 +242,60 @@ def register_dynamic_tool(tool_name: str, tool_config: Dict[str, Any]):
     # Get SQL statement
     sql_statement = tool_config.get('statement', '')
     if not sql_statement:
-        print(f"Warning: No SQL statement defined for tool {tool_name}")
+        logger.warning(f"No SQL statement defined for tool {tool_name}")
         return
 
     # Get parameters
     parameters = tool_config.get('parameters', [])
     param_names = [p.get('name') for p in parameters]
 
-    # Create the dynamic function
-    def dynamic_tool(*args, **kwargs):
-        """Dynamically generated SQL tool."""
-        conn = get_mysql_connection()
-        cursor = conn.cursor()
+    # Build a typed signature so FastMCP can derive a precise schema for the tool
+    valid_types = {'str', 'int', 'float', 'bool', 'dict', 'list'}
+    typed_params = []
+    for param in parameters:
+        param_name = param.get('name')
+        param_type = param.get('type', 'str')
+        if not isinstance(param_name, str) or not param_name.isidentifier() or keyword.iskeyword(param_name):
+            logger.warning(f"Invalid parameter name '{param_name}' for tool {tool_name}")
+            return
+        if param_type not in valid_types:
+            logger.warning(f"Invalid parameter type '{param_type}' for parameter '{param_name}'. Using 'str' instead.")
+            param_type = 'str'
+        typed_params.append(f"{param_name}: {param_type}")
 
-        # Map positional args to named parameters
-        param_values = args
+    if not func_name.isidentifier() or keyword.iskeyword(func_name):
+        logger.warning(f"Tool name {tool_name} is not a valid function name")
+        return
 
-        # Replace $1, $2, etc. with %s for MySQL
-        query = sql_statement
-        for i in range(len(param_names), 0, -1):
-            query = query.replace(f"${i}", "%s")
+    # $N refers to the N-th parameter, so placeholders may be reordered or repeated
+    bind_order = [int(index) - 1 for index in _PLACEHOLDER_RE.findall(sql_statement)]
+    if any(not 0 <= index < len(param_names) for index in bind_order):
+        logger.warning(f"Tool {tool_name} uses a placeholder with no matching parameter")
+        return
 
-        # Execute the query with parameters
-        if param_values:
-            if len(param_values) == 1:
-                cursor.execute(query, (param_values[0],))
-            else:
-                cursor.execute(query, param_values)
-        else:
-            cursor.execute(query)
+    # Replace $1, $2, etc. with %s for MySQL once, at registration time.
+    # Literal % signs are escaped first since aiomysql interpolates with the % operator.
+    compiled_sql = _PLACEHOLDER_RE.sub("%s", sql_statement.replace("%", "%%"))
 
-        try:
-            result = cursor.fetchall()
-            return str(result)
-        except mysql.connector.InterfaceError:
-            return "Query executed successfully."
-        finally:
-            cursor.close()
-            conn.close()
-
-    # Set the function name and docstring
-    dynamic_tool.__name__ = func_name
+    # Executes the compiled SQL, coalescing concurrent calls into one round-trip
+    executor = BatchingExecutor(compiled_sql)
+
+    # Compile a coroutine function with the tool's exact signature that forwards to _impl,
+    # passing the parameter each placeholder refers to in placeholder order
+    param_tuple = "".join(f"{param_names[index]}, " for index in bind_order)
+    source = (
+        f"async def {func_name}({', '.join(typed_params)}) -> str:\n"
+        f"    return await _impl(({param_tuple}))\n"
+    )
+    namespace = {"_impl": executor.execute}
+    exec(compile(source, f"<dyn:{tool_name}>", "exec"), namespace)
+    dynamic_tool = namespace[func_name]
     dynamic_tool.__doc__ = description
 
     # Register the function with the MCP server
     mcp.tool()(dynamic_tool)
 
-    print(f"Registered dynamic tool: {tool_name}")
+    logger.info(f"Registered dynamic tool: {tool_name}")
 
 # Load dynamic tools before defining static tools
 load_dynamic_tools_from_yaml()
@@ -111,60 +304,89 @@ load_dynamic_tools_from_yaml()
 # These will be used as fallbacks if no dynamic tool matches
 
 @mcp.tool()
-def run_query(query: str) -> str:
+async def run_query(query: str) -> str:
     """Run a SQL query on the configured MySQL database."""
-    conn = get_mysql_connection()
-    cursor = conn.cursor()
-    cursor.execute(query)
-    try:
-        result = cursor.fetchall()
-        return str(result)
-    except mysql.connector.InterfaceError:
-        return "Query executed successfully."
-    finally:
-        cursor.close()
-        conn.close()
+    pool = await get_mysql_pool()
+    async with pool.acquire() as conn, conn.cursor(aiomysql.SSCursor) as cursor:
+        await cursor.execute(query)
+        return await fetch_result(cursor, max_rows=QUERY_ROW_LIMIT)
 
 
 @mcp.tool()
-def get_hotel_address(hotel_id: int) -> str:
+async def get_hotel_address(hotel_id: int) -> str:
     """Run a SQL query which returns the hotel address, given its ID, on the configured MySQL database from Hotel table."""
-    conn = get_mysql_connection()
-    cursor = conn.cursor()
-    query = "SELECT address FROM Hotel WHERE id = %s"
-    cursor.execute(query, (hotel_id,))
-    try:
-        result = cursor.fetchall()
-        return str(result)
-    except mysql.connector.InterfaceError:
-        return "Query executed successfully."
-    finally:
-        cursor.close()
-        conn.close()
+    pool = await get_mysql_pool()
+    async with pool.acquire() as conn, conn.cursor(aiomysql.SSCursor) as cursor:
+        query = "SELECT address FROM Hotel WHERE id = %s"
+        await cursor.execute(query, (hotel_id,))
+        return await fetch_result(cursor)
+
+
+# Schema metadata rarely changes, so it is cached in-process for a short TTL
+SCHEMA_CACHE_TTL = float(os.getenv("MYSQL_SCHEMA_CACHE_TTL", "60"))
+_schema_cache: Dict[Any, Any] = {}
+_schema_cache_ts = time.monotonic()
+
+
+def _expire_schema_cache():
+    """Clear the cached schema metadata once it is older than SCHEMA_CACHE_TTL."""
+    global _schema_cache_ts
+    now = time.monotonic()
+    if now - _schema_cache_ts > SCHEMA_CACHE_TTL:
+        _schema_cache.clear()
+        _schema_cache_ts = now
+
+
+async def _list_tables_impl() -> tuple:
+    if "tables" not in _schema_cache:
+        pool = await get_mysql_pool()
+        async with pool.acquire() as conn, conn.cursor() as cursor:
+            await cursor.execute(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() ORDER BY table_name"
+            )
+            tables = tuple(table[0] for table in await cursor.fetchall())
+        _schema_cache["tables"] = tables
+        _schema_cache["table_names"] = frozenset(tables)
+    return _schema_cache["tables"]
+
+
+async def _table_names() -> frozenset:
+    await _list_tables_impl()
+    return _schema_cache["table_names"]
+
+
+async def _describe_table_impl(table_name: str) -> tuple:
+    key = ("columns", table_name)
+    if key not in _schema_cache:
+        pool = await get_mysql_pool()
+        async with pool.acquire() as conn, conn.cursor() as cursor:
+            await cursor.execute(
+                "SELECT column_name, column_type, is_nullable, column_key, column_default, extra "
+                "FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = %s "
+                "ORDER BY ordinal_position",
+                (table_name,),
+            )
+            _schema_cache[key] = tuple(await cursor.fetchall())
+    return _schema_cache[key]
 
 
 @mcp.tool()
-def list_tables() -> list:
+async def list_tables() -> list:
     """List all tables in the current MySQL database."""
-    conn = get_mysql_connection()
-    cursor = conn.cursor()
-    cursor.execute("SHOW TABLES")
-    tables = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return [table[0] for table in tables]
+    _expire_schema_cache()
+    return list(await _list_tables_impl())
 
 
 @mcp.tool()
-def describe_table(table_name: str) -> list:
+async def describe_table(table_name: str) -> list:
     """Describe the structure of a table."""
-    conn = get_mysql_connection()
-    cursor = conn.cursor()
-    cursor.execute(f"DESCRIBE {table_name}")
-    result = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return result
+    _expire_schema_cache()
+    # Only known tables are described, which also keeps arbitrary input out of the cache
+    if table_name not in await _table_names():
+        raise ValueError(f"Unknown table: {table_name}")
+    return list(await _describe_table_impl(table_name))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+"""
+Access to the MySQL tools YAML configuration for mysql_agent_mcp.py.
+
+That server runs as a standalone script and cannot import the adk package, so it reads the
+file here, once per process. Code inside the adk package uses get_tool_loader instead.
+"""
+
+import os
+import pathlib
+from typing import Dict, Any, Optional
+
+import yaml
+
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Path to the YAML configuration file
+CONFIG_FILE = os.path.join(pathlib.Path(__file__).parent.parent.parent, "tools", "mysql_tool", "mysql_tools.yaml")
+
+_config: Optional[Dict[str, Any]] = None
+
+
+def load_tools_config() -> Dict[str, Any]:
+    """Return the parsed YAML configuration, reading the file on first use only."""
+    global _config
+    if _config is None:
+        with open(CONFIG_FILE, 'rb') as f:
+            _config = yaml.load(f, Loader=_YAML_LOADER) or {}
+    return _config
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional, Tuple
+
+from google.adk.tools import BaseTool
+from google.adk.tools.mcp_tool import MCPToolset
+from mcp import StdioServerParameters
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledMCPServer:
+    """A running MCP server shared by every caller with the same launch parameters."""
+
+    def __init__(self):
+        self.ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.shutdown = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.refcount = 0
+
+
+# Running MCP servers keyed by (command, args, env), each with a lock that serializes its start/stop
+_mcp_pool: Dict[tuple, _PooledMCPServer] = {}
+_mcp_pool_locks: Dict[tuple, asyncio.Lock] = {}
+
+
+async def _serve(server_params: StdioServerParameters, server: _PooledMCPServer):
+    """
+    Own one MCP server for its whole lifetime.
+
+    The stdio client's task group must be entered and exited by the same task, so the
+    server is started, kept open until shutdown is signalled and closed all in this task.
+    """
+    try:
+        tools, exit_stack = await MCPToolset.from_server(connection_params=server_params)
+    except Exception as e:
+        logger.error("Failed to start MCP server %s: %s", server_params.command, e)
+        server.ready.set_exception(e)
+        # Mark it retrieved: waiting callers still re-raise it, but a caller cancelled in the
+        # meantime never would, and asyncio would warn about an unretrieved exception
+        server.ready.exception()
+        return
+    except BaseException:
+        server.ready.cancel()
+        raise
+
+    async with exit_stack:
+        server.ready.set_result(tools)
+        await server.shutdown.wait()
+
+
+async def acquire_mcp_server(server_params: StdioServerParameters) -> Tuple[List[BaseTool], AsyncExitStack]:
+    """
+    Return the tools of a running MCP server for these parameters, starting one if needed.
+
+    Args:
+        server_params: The stdio parameters used to launch the server
+
+    Returns:
+        A tuple of (tools, exit_stack); closing the exit stack (from any task) releases this
+        caller's reference, and the server is shut down once the last reference is released
+    """
+    key = (server_params.command, tuple(server_params.args), frozenset((server_params.env or {}).items()))
+    while True:
+        lock = _mcp_pool_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if _mcp_pool_locks.get(key) is not lock:
+                # The server was stopped and its lock dropped while we waited; start over
+                continue
+            server = _mcp_pool.get(key)
+            if server is None:
+                server = _PooledMCPServer()
+                server.task = asyncio.create_task(_serve(server_params, server))
+                try:
+                    # Shielded so a cancelled caller doesn't cancel the start for the owner task
+                    await asyncio.shield(server.ready)
+                except BaseException:
+                    # Nobody holds the server yet, so stop it as soon as it is up
+                    server.shutdown.set()
+                    del _mcp_pool_locks[key]
+                    raise
+                _mcp_pool[key] = server
+            server.refcount += 1
+            break
+
+    handle = AsyncExitStack()
+    handle.push_async_callback(_release_mcp_server, key)
+    return server.ready.result(), handle
+
+
+async def _release_mcp_server(key: tuple):
+    """Drop one reference to a pooled MCP server, shutting it down with the last one."""
+    async with _mcp_pool_locks[key]:
+        server = _mcp_pool[key]
+        server.refcount -= 1
+        if server.refcount == 0:
+            del _mcp_pool[key]
+            del _mcp_pool_locks[key]
+            server.shutdown.set()
+            # The owner task closes the server; wait for it so shutdown errors reach the caller
+            await server.task
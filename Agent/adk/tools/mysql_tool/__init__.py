@@ -7,16 +7,18 @@ This package provides functionality to dynamically load tools from YAML configur
 # Define __all__ to control what's imported with 'from package import *'
 __all__ = [
     'ToolLoader',
+    'get_tool_loader',
     'ToolConfig',
     'SourceConfig',
     'ToolsetConfig',
+    'ResolvedToolset',
     'DynamicMySQLMCPGenerator',
 ]
 
 # Import the models first to avoid circular imports
 try:
-    from adk.tools.mysql_tool.models import ToolConfig, SourceConfig, ToolsetConfig
-    from adk.tools.mysql_tool.tool_loader import ToolLoader
+    from adk.tools.mysql_tool.models import ToolConfig, SourceConfig, ToolsetConfig, ResolvedToolset
+    from adk.tools.mysql_tool.tool_loader import ToolLoader, get_tool_loader
     from adk.tools.mysql_tool.mysql_tool_generator import DynamicMySQLMCPGenerator
 except ImportError as e:
     # Log the import error but don't crash the module
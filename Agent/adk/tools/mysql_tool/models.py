@@ -4,64 +4,137 @@ Data models for dynamic tool loading.
 This module provides data models for representing tool configurations.
 """
 
-from typing import Dict, List, Any
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
 
+# Positional SQL placeholders ($1, $2, ...) used in the YAML configuration
+_PLACEHOLDER_RE = re.compile(r"\$(\d+)")
 
+
+@dataclass(slots=True, frozen=True)
 class ToolConfig:
     """Configuration for a tool loaded from YAML."""
-    
-    def __init__(self, name: str, config: Dict[str, Any]):
+
+    name: str
+    kind: Optional[str]
+    source_name: Optional[str]
+    description: str
+    parameters: List[Dict[str, Any]] = field(compare=False)
+    statement: str
+    # Index into parameters of the value bound to each %s in statement, in order
+    bind_order: Tuple[int, ...]
+    # The mutable YAML mappings are left out of eq/hash so the frozen models stay hashable
+    config: Dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_yaml(cls, name: str, config: Dict[str, Any]) -> "ToolConfig":
         """
-        Initialize a tool configuration.
-        
+        Create a tool configuration from its YAML entry.
+
         Args:
             name: The name of the tool
             config: The configuration dictionary for the tool
+
+        Raises:
+            ValueError: If the statement uses a $N placeholder with no matching parameter
         """
-        self.name = name
-        self.config = config
-        self.kind = config.get('kind')
-        self.source_name = config.get('source')
-        self.description = config.get('description', '')
-        self.parameters = config.get('parameters', [])
-        self.statement = config.get('statement', '')
-    
+        parameters = config.get('parameters', [])
+        statement = config.get('statement', '')
+
+        # $N refers to the N-th parameter, so placeholders may be reordered or repeated
+        bind_order = tuple(int(index) - 1 for index in _PLACEHOLDER_RE.findall(statement))
+        for index in bind_order:
+            if not 0 <= index < len(parameters):
+                raise ValueError(f"Tool {name} uses placeholder ${index + 1} but has {len(parameters)} parameters")
+
+        return cls(
+            name=name,
+            kind=config.get('kind'),
+            source_name=config.get('source'),
+            description=config.get('description', ''),
+            parameters=parameters,
+            # Stored with MySQL %s placeholders, so consumers never have to rewrite it
+            statement=_PLACEHOLDER_RE.sub("%s", statement),
+            bind_order=bind_order,
+            config=config,
+        )
+
     def __repr__(self) -> str:
         return f"ToolConfig(name={self.name}, kind={self.kind})"
 
 
+@dataclass(slots=True, frozen=True)
 class SourceConfig:
     """Configuration for a data source loaded from YAML."""
-    
-    def __init__(self, name: str, config: Dict[str, Any]):
+
+    name: str
+    kind: Optional[str]
+    config: Dict[str, Any] = field(repr=False, compare=False)
+    # Derived values, computed once here since slotted classes have no cached_property
+    port_str: str = field(init=False, repr=False, compare=False)
+    # The MySQL MCP server environment; shared by every launch, so it must not be mutated
+    mysql_env: Dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        config = self.config
+        # Frozen dataclasses only allow setting fields through object.__setattr__
+        object.__setattr__(self, 'port_str', str(config.get('port', 3306)))
+        object.__setattr__(self, 'mysql_env', {
+            "MYSQL_HOST": config.get('host', 'localhost'),
+            "MYSQL_PORT": self.port_str,
+            "MYSQL_DATABASE": config.get('database', ''),
+            "MYSQL_USER": config.get('user', ''),
+            "MYSQL_PASSWORD": config.get('password', ''),
+        })
+
+    @classmethod
+    def from_yaml(cls, name: str, config: Dict[str, Any]) -> "SourceConfig":
         """
-        Initialize a source configuration.
-        
+        Create a source configuration from its YAML entry.
+
         Args:
             name: The name of the source
             config: The configuration dictionary for the source
         """
-        self.name = name
-        self.config = config
-        self.kind = config.get('kind')
-    
+        return cls(name=name, kind=config.get('kind'), config=config)
+
     def __repr__(self) -> str:
         return f"SourceConfig(name={self.name}, kind={self.kind})"
 
 
+@dataclass(slots=True, frozen=True)
 class ToolsetConfig:
     """Configuration for a toolset loaded from YAML."""
-    
-    def __init__(self, name: str, tool_names: List[str]):
+
+    name: str
+    tool_names: Tuple[str, ...]
+
+    @classmethod
+    def from_yaml(cls, name: str, tool_names: List[str]) -> "ToolsetConfig":
         """
-        Initialize a toolset configuration.
-        
+        Create a toolset configuration from its YAML entry.
+
         Args:
             name: The name of the toolset
             tool_names: List of tool names in this toolset
         """
-        self.name = name
-        self.tool_names = tool_names
-    
+        return cls(name=name, tool_names=tuple(tool_names))
+
     def __repr__(self) -> str:
         return f"ToolsetConfig(name={self.name}, tools={self.tool_names})"
+
+
+@dataclass(slots=True, frozen=True)
+class ResolvedToolset:
+    """A toolset with its tools and shared source looked up and validated."""
+
+    name: str
+    tools: Tuple[ToolConfig, ...]
+    source: SourceConfig
+    source_kind: Optional[str]
+    # The source's MCP server environment, merged with the inherited variables once per load
+    launch_env: Dict[str, str] = field(repr=False, compare=False)
+
+    def __repr__(self) -> str:
+        return f"ResolvedToolset(name={self.name}, kind={self.source_kind}, tools={len(self.tools)})"
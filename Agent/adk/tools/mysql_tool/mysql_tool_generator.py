@@ -5,35 +5,26 @@ This module provides functionality to generate dynamic MySQL MCP tools based on
 """
 
 import os
+import json
+import hashlib
 import tempfile
 import logging
+from contextlib import suppress
 from typing import List, Dict, Any
 
 from adk.tools.mysql_tool.models import ToolConfig
 
 logger = logging.getLogger(__name__)
 
-class DynamicMySQLMCPGenerator:
-    """Generates a dynamic MySQL MCP server script based on tool configurations."""
-
-    @staticmethod
-    def generate_mcp_script(tools: List[ToolConfig]) -> str:
-        """
-        Generate a MySQL MCP server script for the given tools.
-
-        Args:
-            tools: List of tool configurations
-
-        Returns:
-            A string containing the Python script for the MCP server
-        """
-        script = """#!/usr/bin/env python3
+# Script preamble: imports, connection helper and the standard run_query tool
+SCRIPT_HEADER = """#!/usr/bin/env python3
 \"\"\"
 Dynamically generated MySQL MCP Tool: FastMCP server exposing MySQL-related tools.
 \"\"\"
 
 import os
 import mysql.connector
+import orjson
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 
@@ -50,10 +41,10 @@ def get_mysql_connection():
         port=int(os.getenv("MYSQL_PORT")),
     )
 
-"""
+def serialize_rows(columns, rows):
+    return orjson.dumps([dict(zip(columns, row)) for row in rows], default=str).decode()
+
 
-        # Add the standard run_query tool
-        script += """
 @mcp.tool()
 def run_query(query: str) -> str:
     \"\"\"Run a SQL query on the configured MySQL database.\"\"\"
@@ -61,8 +52,29 @@ def run_query(query: str) -> str:
     cursor = conn.cursor()
     cursor.execute(query)
     try:
-        result = cursor.fetchall()
-        return str(result)
+        return serialize_rows(cursor.column_names, cursor.fetchall())
+    except mysql.connector.InterfaceError:
+        return "Query executed successfully."
+    finally:
+        cursor.close()
+        conn.close()
+
+"""
+
+# One dynamic tool, filled in with str.format
+TOOL_TEMPLATE = """
+@mcp.tool()
+def {func_name}({params_str}) -> str:
+    \"\"\"{description}\"\"\"
+    conn = get_mysql_connection()
+    cursor = conn.cursor()
+
+    # Prepare the SQL statement with parameters
+    query = \"\"\"{sql}\"\"\"
+
+{execute}
+    try:
+        return serialize_rows(cursor.column_names, cursor.fetchall())
     except mysql.connector.InterfaceError:
         return "Query executed successfully."
     finally:
@@ -71,6 +83,45 @@ def run_query(query: str) -> str:
 
 """
 
+SCRIPT_FOOTER = """
+if __name__ == "__main__":
+    mcp.run()
+"""
+
+
+# Generated scripts are run with the database credentials in their environment, so they live in a
+# per-user directory that no one else can write to, rather than in the shared temp directory
+SCRIPT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "agent", "mcp_scripts")
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """Whether a file or directory is owned by this user and not writable by anyone else."""
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+# Bump when generate_mcp_script changes the code it emits, so cached scripts are not reused
+_GENERATOR_VERSION = 2
+_TEMPLATE_DIGEST = hashlib.blake2b(
+    f"{_GENERATOR_VERSION}{SCRIPT_HEADER}{TOOL_TEMPLATE}{SCRIPT_FOOTER}".encode(), digest_size=16
+).hexdigest()
+
+
+class DynamicMySQLMCPGenerator:
+    """Generates a dynamic MySQL MCP server script based on tool configurations."""
+
+    @staticmethod
+    def generate_mcp_script(tools: List[ToolConfig]) -> str:
+        """
+        Generate a MySQL MCP server script for the given tools.
+
+        Args:
+            tools: List of tool configurations
+
+        Returns:
+            A string containing the Python script for the MCP server
+        """
+        parts = [SCRIPT_HEADER]
+
         # Add dynamic tools based on configuration
         for tool in tools:
             if tool.kind == 'mysql-sql':
@@ -95,74 +146,83 @@ def run_query(query: str) -> str:
 
                 params_str = ", ".join(params_code)
 
-                # Build SQL statement with parameter substitution
-                sql_statement = tool.statement
-
-                # Replace $1, $2, etc. with %s for MySQL
-                for i in range(len(param_names), 0, -1):
-                    sql_statement = sql_statement.replace(f"${i}", "%s")
-
-                # Create the function
-                script += f"""
-@mcp.tool()
-def {func_name}({params_str}) -> str:
-    \"\"\"{tool.description}\"\"\"
-    conn = get_mysql_connection()
-    cursor = conn.cursor()
-
-    # Prepare the SQL statement with parameters
-    query = \"\"\"{sql_statement}\"\"\"
-
-"""
+                # Bind the parameter each placeholder refers to, in placeholder order
+                bind_names = [param_names[index] for index in tool.bind_order]
 
                 # Add parameter handling based on the number of parameters
-                if param_names:
-                    params_tuple = ", ".join(param_names)
-                    if len(param_names) == 1:
+                if bind_names:
+                    params_tuple = ", ".join(bind_names)
+                    if len(bind_names) == 1:
                         # For a single parameter, we need to make it a tuple with a trailing comma
-                        script += f"    cursor.execute(query, ({params_tuple},))\n"
+                        execute = f"    cursor.execute(query, ({params_tuple},))\n"
                     else:
-                        script += f"    cursor.execute(query, ({params_tuple}))\n"
+                        execute = f"    cursor.execute(query, ({params_tuple}))\n"
                 else:
-                    script += "    cursor.execute(query)\n"
-
-                script += """
-    try:
-        result = cursor.fetchall()
-        return str(result)
-    except mysql.connector.InterfaceError:
-        return "Query executed successfully."
-    finally:
-        cursor.close()
-        conn.close()
+                    execute = "    cursor.execute(query)\n"
 
-"""
+                # Create the function
+                parts.append(TOOL_TEMPLATE.format(
+                    func_name=func_name,
+                    params_str=params_str,
+                    description=tool.description,
+                    sql=tool.statement,
+                    execute=execute,
+                ))
 
         # Add the main block
-        script += """
-if __name__ == "__main__":
-    mcp.run()
-"""
+        parts.append(SCRIPT_FOOTER)
 
-        return script
+        return "".join(parts)
 
     @staticmethod
     def create_temp_script_file(tools: List[ToolConfig]) -> str:
         """
-        Create a temporary file with the generated MCP script.
+        Create a file in SCRIPT_DIR with the generated MCP script.
+
+        The file name is derived from a hash of the tool configurations and the script templates,
+        so identical toolsets map to the same file and an existing file is reused without
+        generating the script again. Files are left in place for later runs to reuse, but only
+        while they are owned by this user and not writable by anyone else.
 
         Args:
             tools: List of tool configurations
 
         Returns:
-            Path to the temporary script file
+            Path to the script file
         """
+        payload = json.dumps([[tool.name, tool.config] for tool in tools], sort_keys=True, default=str)
+        digest = hashlib.blake2b(f"{_TEMPLATE_DIGEST}:{payload}".encode(), digest_size=16).hexdigest()
+        os.makedirs(SCRIPT_DIR, mode=0o700, exist_ok=True)
+        if not _is_private(os.stat(SCRIPT_DIR)):
+            raise PermissionError(f"Refusing to use {SCRIPT_DIR}: it must be owned by this user and not writable by others")
+        script_path = os.path.join(SCRIPT_DIR, f"mcp_mysql_{digest}.py")
+
+        try:
+            reusable = _is_private(os.lstat(script_path))
+        except FileNotFoundError:
+            reusable = False
+        if reusable:
+            logger.info(f"Reusing dynamic MySQL MCP script at {script_path}")
+            return script_path
+
         script_content = DynamicMySQLMCPGenerator.generate_mcp_script(tools)
 
-        # Create a temporary file for the script
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(script_content)
-            script_path = f.name
+        # Fail here, with a clear error, rather than in the MCP subprocess
+        compile(script_content, script_path, 'exec')
+
+        # Write to a temporary name first so concurrent writers never expose a partial script
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', dir=SCRIPT_DIR, delete=False) as f:
+                tmp_path = f.name
+                f.write(script_content)
+            os.replace(tmp_path, script_path)
+        except OSError:
+            # Don't leave a partial script behind in the script directory
+            if tmp_path is not None:
+                with suppress(FileNotFoundError):
+                    os.unlink(tmp_path)
+            raise
 
         logger.info(f"Created dynamic MySQL MCP script at {script_path}")
         return script_path
@@ -7,63 +7,106 @@ It supports MySQL database tools with configurable SQL statements.
 
 import os
 import yaml
+import asyncio
+import functools
+import hashlib
 import logging
+import pickle
+import sys
 import tempfile
-from typing import Dict, List, Any, Optional, Tuple, Union
-from contextlib import AsyncExitStack
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple, Union
+from contextlib import AsyncExitStack, suppress
 
 from google.adk.tools import BaseTool
-from google.adk.tools.mcp_tool import MCPToolset
 from mcp import StdioServerParameters
 
-from adk.tools.mysql_tool.models import ToolConfig, SourceConfig, ToolsetConfig
+from adk.tools.mcp_pool import acquire_mcp_server
+from adk.tools.mysql_tool.models import ToolConfig, SourceConfig, ToolsetConfig, ResolvedToolset
 
 # Import after models to avoid circular imports
-from adk.tools.mysql_tool.mysql_tool_generator import DynamicMySQLMCPGenerator
+from adk.tools.mysql_tool.mysql_tool_generator import DynamicMySQLMCPGenerator, _is_private
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# orjson for the JSON copy of the configuration when installed, the standard library otherwise
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Parsed configurations are pickled here, keyed by config path, mtime and size, next to a JSON
+# copy of each raw configuration. Unpickling runs code, so the directory and each pickle are
+# only trusted while private to this user.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "agent", "toolloader")
+
+# Bump when the cached models change shape, so stale pickles are ignored
+_CACHE_VERSION = 7
+
+# The MCP client only passes a minimal default environment to servers, so forward the import path explicitly
+_INHERITED_ENV = {key: os.environ[key] for key in ("PYTHONPATH",) if key in os.environ}
+
+
+def _launch_env(source_config: SourceConfig) -> Dict[str, str]:
+    """Build the environment a MySQL MCP server for this source is started with."""
+    return {**_INHERITED_ENV, **source_config.mysql_env}
+
 
 class ToolFactory:
     """Factory for creating tools from configurations."""
 
     @staticmethod
-    async def create_mysql_tool(tool_config: ToolConfig, source_config: SourceConfig) -> Tuple[List[BaseTool], AsyncExitStack]:
+    async def _launch_mysql_mcp(launch_env: Dict[str, str], script_args: List[str]) -> Tuple[List[BaseTool], AsyncExitStack]:
         """
-        Create a MySQL tool using MCP.
+        Start (or reuse) a MySQL MCP server connected to a source.
 
         Args:
-            tool_config: The tool configuration
-            source_config: The source configuration
+            launch_env: The server environment, as built by _launch_env for the source
+            script_args: The server script and its arguments
 
         Returns:
             A tuple of (tools, exit_stack)
         """
-        # Extract source configuration
-        host = source_config.config.get('host', 'localhost')
-        port = source_config.config.get('port', 3306)
-        database = source_config.config.get('database', '')
-        user = source_config.config.get('user', '')
-        password = source_config.config.get('password', '')
-
-        # Create environment variables for the MCP server
-        env = {
-            "MYSQL_HOST": host,
-            "MYSQL_PORT": str(port),
-            "MYSQL_DATABASE": database,
-            "MYSQL_USER": user,
-            "MYSQL_PASSWORD": password,
-        }
-
-        # Set up MCP server parameters
+        # Set up MCP server parameters; run the server with this interpreter rather than whatever "python" is on PATH
         server_params = StdioServerParameters(
-            command="python",
-            args=["sub_agents/mysql_mcp/mysql_mcp.py"],
-            env=env
+            command=sys.executable,
+            args=script_args,
+            env=launch_env
         )
 
         # Create MCP toolset
-        tools, exit_stack = await MCPToolset.from_server(connection_params=server_params)
+        return await acquire_mcp_server(server_params)
+
+    @staticmethod
+    async def create_mysql_tool(
+        tool_config: ToolConfig,
+        source_config: SourceConfig,
+        launch_env: Optional[Dict[str, str]] = None,
+    ) -> Tuple[List[BaseTool], AsyncExitStack]:
+        """
+        Create a MySQL tool using MCP.
+
+        Args:
+            tool_config: The tool configuration
+            source_config: The source configuration
+            launch_env: The server environment for the source, built from source_config if omitted
+
+        Returns:
+            A tuple of (tools, exit_stack)
+        """
+        if launch_env is None:
+            launch_env = _launch_env(source_config)
+        tools, exit_stack = await ToolFactory._launch_mysql_mcp(launch_env, ["sub_agents/mysql_mcp/mysql_mcp.py"])
         logger.info(f"Created MySQL MCP tool: {tool_config.name}")
         return tools, exit_stack
 
@@ -82,35 +125,203 @@ class ToolLoader:
         self.sources: Dict[str, SourceConfig] = {}
         self.tools: Dict[str, ToolConfig] = {}
         self.toolsets: Dict[str, ToolsetConfig] = {}
+        # Ready-to-call server launchers per toolset, rebuilt after every load; empty toolsets are omitted
+        self._supported_toolsets: Dict[str, Callable[[], Awaitable[Tuple[List[BaseTool], AsyncExitStack]]]] = {}
+        # MCP server environment per source name, built once per load and shared by every launch
+        self._launch_envs: Dict[str, Dict[str, str]] = {}
         self._load_config()
 
     def _load_config(self):
-        """Load the configuration from the YAML file."""
+        """Load the configuration, from the on-disk cache when the YAML file is unchanged."""
         try:
-            with open(self.config_file, 'r') as f:
-                config = yaml.safe_load(f)
-
-            # Load sources
-            sources_config = config.get('sources', {})
-            for name, source_config in sources_config.items():
-                self.sources[name] = SourceConfig(name, source_config)
-
-            # Load tools
-            tools_config = config.get('tools', {})
-            for name, tool_config in tools_config.items():
-                self.tools[name] = ToolConfig(name, tool_config)
-
-            # Load toolsets
-            toolsets_config = config.get('toolsets', {})
-            for name, tool_names in toolsets_config.items():
-                self.toolsets[name] = ToolsetConfig(name, tool_names)
+            stat = os.stat(self.config_file)
+            cache_path = self._cache_path(stat)
+            if self._load_cached_config(cache_path):
+                logger.info(f"Loaded cached configuration for {self.config_file}")
+            else:
+                self._parse_config(stat)
+                self._save_cached_config(cache_path)
+                logger.info(f"Loaded configuration from {self.config_file}")
 
-            logger.info(f"Loaded configuration from {self.config_file}")
+            self._resolve_toolsets()
             logger.info(f"Found {len(self.sources)} sources, {len(self.tools)} tools, and {len(self.toolsets)} toolsets")
-        except Exception as e:
+        except (OSError, yaml.YAMLError, ValueError) as e:
             logger.error(f"Error loading configuration: {e}")
             raise
 
+    def _parse_config(self, stat: os.stat_result):
+        """Parse the configuration file and build the configuration models."""
+        config = self._read_config(stat)
+
+        # Load sources
+        sources_config = config.get('sources', {})
+        for name, source_config in sources_config.items():
+            self.sources[name] = SourceConfig.from_yaml(name, source_config)
+
+        # Load tools
+        tools_config = config.get('tools', {})
+        for name, tool_config in tools_config.items():
+            self.tools[name] = ToolConfig.from_yaml(name, tool_config)
+
+        # Load toolsets
+        toolsets_config = config.get('toolsets', {})
+        for name, tool_names in toolsets_config.items():
+            self.toolsets[name] = ToolsetConfig.from_yaml(name, tool_names)
+
+    def _resolve_toolsets(self):
+        """Look up and validate every toolset's tools, source and source kind once, so loads only fetch a launcher."""
+        launchers = {
+            'mysql': self._launch_mysql_toolset,
+        }
+        self._launch_envs = {name: _launch_env(source_config) for name, source_config in self.sources.items()}
+        self._supported_toolsets = {}
+        for toolset_name, toolset_config in self.toolsets.items():
+            tool_configs = []
+            source_kind = None
+
+            for tool_name in toolset_config.tool_names:
+                if tool_name not in self.tools:
+                    raise ValueError(f"Tool {tool_name} not found in configuration")
+
+                tool_config = self.tools[tool_name]
+                source_name = tool_config.source_name
+
+                if source_name not in self.sources:
+                    raise ValueError(f"Source {source_name} not found for tool {tool_name}")
+
+                # Check if all tools use the same type of source
+                kind = self.sources[source_name].kind
+                if not tool_configs:
+                    source_kind = kind
+                elif kind != source_kind:
+                    raise ValueError(f"All tools in toolset {toolset_name} must use the same type of source. Found: {source_kind} and {kind}")
+                tool_configs.append(tool_config)
+
+            # Empty toolsets are skipped when loaded
+            if not tool_configs:
+                continue
+
+            if source_kind not in launchers:
+                raise ValueError(f"Unsupported source type: {source_kind} for toolset {toolset_name}")
+
+            # The first tool's source config (they all use the same source type)
+            source_name = tool_configs[0].source_name
+            resolved = ResolvedToolset(
+                name=toolset_name,
+                tools=tuple(tool_configs),
+                source=self.sources[source_name],
+                source_kind=source_kind,
+                launch_env=self._launch_envs[source_name],
+            )
+            self._supported_toolsets[toolset_name] = functools.partial(launchers[source_kind], resolved)
+
+    def _read_config(self, stat: os.stat_result) -> Dict[str, Any]:
+        """
+        Read the raw configuration, preferring its JSON copy in CACHE_DIR while it is up to date.
+
+        The copy records the mtime and size of the YAML file it was made from and is only used
+        while both still match exactly.
+
+        Args:
+            stat: The stat result of the YAML file
+
+        Returns:
+            The configuration dictionary
+        """
+        json_path = os.path.join(CACHE_DIR, f"{hashlib.sha1(os.path.abspath(self.config_file).encode()).hexdigest()}.json")
+        try:
+            with open(json_path, 'rb') as f:
+                cached = _json_loads(f.read())
+            if (
+                isinstance(cached, dict)
+                and cached.get('mtime_ns') == stat.st_mtime_ns
+                and cached.get('size') == stat.st_size
+                and 'config' in cached
+            ):
+                return cached['config']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable configuration cache {json_path}: {e}")
+
+        # Opened in binary mode so libyaml decodes the bytes itself
+        with open(self.config_file, 'rb') as f:
+            config = yaml.load(f, Loader=_YAML_LOADER)
+
+        try:
+            data = _json_dumps({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'config': config})
+        except (TypeError, ValueError):
+            data = None
+        # orjson stringifies dates and json stringifies non-string keys, so only keep copies that read back identical
+        if data is None or _json_loads(data)['config'] != config:
+            logger.info(f"Configuration {self.config_file} has values without an exact JSON form, not caching it as JSON")
+            return config
+
+        tmp_path = None
+        try:
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+            # Write to a temporary name first so readers never see a partial file
+            with tempfile.NamedTemporaryFile(mode='wb', dir=CACHE_DIR, suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                f.write(data)
+            os.replace(tmp_path, json_path)
+        except OSError as e:
+            if tmp_path is not None:
+                with suppress(FileNotFoundError):
+                    os.unlink(tmp_path)
+            logger.warning(f"Could not write configuration cache {json_path}: {e}")
+
+        return config
+
+    def _cache_path(self, stat: os.stat_result) -> str:
+        """Return the cache file for the given state of the configuration file."""
+        key = f"{_CACHE_VERSION}:{os.path.abspath(self.config_file)}:{stat.st_mtime_ns}:{stat.st_size}"
+        return os.path.join(CACHE_DIR, f"{hashlib.sha1(key.encode()).hexdigest()}.pkl")
+
+    def _load_cached_config(self, cache_path: str) -> bool:
+        """
+        Load the configuration models from the cache.
+
+        Returns:
+            True if the cache was present and readable
+        """
+        try:
+            if not _is_private(os.stat(CACHE_DIR)):
+                logger.warning(f"Ignoring configuration cache in {CACHE_DIR}: it must be owned by this user and not writable by others")
+                return False
+            with open(cache_path, 'rb') as f:
+                if not _is_private(os.fstat(f.fileno())):
+                    logger.warning(f"Ignoring configuration cache {cache_path}: it must be owned by this user and not writable by others")
+                    return False
+                self.sources, self.tools, self.toolsets = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        # Truncated or corrupt pickles, pickles of classes that moved or changed, and a wrong payload shape
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable configuration cache {cache_path}: {e}")
+            return False
+        return True
+
+    def _save_cached_config(self, cache_path: str):
+        """Write the configuration models to the cache; failures only cost the next start a re-parse."""
+        tmp_path = None
+        try:
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+            if not _is_private(os.stat(CACHE_DIR)):
+                logger.warning(f"Not writing configuration cache to {CACHE_DIR}: it must be owned by this user and not writable by others")
+                return
+            # Write to a temporary name first so readers never see a partial pickle
+            with tempfile.NamedTemporaryFile(mode='wb', dir=CACHE_DIR, suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                pickle.dump((self.sources, self.tools, self.toolsets), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except (OSError, pickle.PicklingError) as e:
+            # Don't leave a partial pickle behind in the cache directory
+            if tmp_path is not None:
+                with suppress(FileNotFoundError):
+                    os.unlink(tmp_path)
+            logger.warning(f"Could not write configuration cache {cache_path}: {e}")
+
     async def load_tool(self, tool_name: str) -> Tuple[List[BaseTool], AsyncExitStack]:
         """
         Load a specific tool by name.
@@ -134,7 +345,7 @@ class ToolLoader:
 
         # Create the tool based on its kind
         if tool_config.kind == 'mysql-sql':
-            return await ToolFactory.create_mysql_tool(tool_config, source_config)
+            return await ToolFactory.create_mysql_tool(tool_config, source_config, self._launch_envs[source_name])
         else:
             raise ValueError(f"Unsupported tool kind: {tool_config.kind}")
 
@@ -157,97 +368,82 @@ class ToolLoader:
             if toolset_name not in self.toolsets:
                 raise ValueError(f"Toolset {toolset_name} not found in configuration")
 
+        launchers = []
+        for toolset_name in toolset_names:
+            launcher = self._supported_toolsets.get(toolset_name)
+            if launcher is None:
+                logger.warning(f"Toolset {toolset_name} has no tools, skipping")
+            else:
+                launchers.append(launcher)
+
+        # Start every toolset's MCP server concurrently
+        results = await asyncio.gather(
+            *(launcher() for launcher in launchers),
+            return_exceptions=True,
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            # Shut down the toolsets that did start, concurrently, before re-raising
+            close_results = await asyncio.gather(
+                *(result[1].aclose() for result in results if isinstance(result, tuple)),
+                return_exceptions=True,
+            )
+            for close_result in close_results:
+                if isinstance(close_result, BaseException):
+                    logger.error(f"Error shutting down MCP toolset: {close_result}")
+            raise errors[0]
+
         all_tools = []
         all_exit_stacks = []
-        script_paths = []
+        for result in results:
+            tools, exit_stack = result
+            all_tools.extend(tools)
+            all_exit_stacks.append(exit_stack)
 
-        # Process each toolset
-        for toolset_name in toolset_names:
-            toolset_config = self.toolsets[toolset_name]
+        return all_tools, all_exit_stacks
 
-            # Generate a dynamic MCP server for all tools in the toolset
-            tool_configs = []
-            source_configs = set()
+    async def _launch_mysql_toolset(self, resolved: ResolvedToolset) -> Tuple[List[BaseTool], AsyncExitStack]:
+        """
+        Start the dynamic MySQL MCP server for a single toolset.
 
-            # Collect all tool configurations and their sources for this toolset
-            for tool_name in toolset_config.tool_names:
-                if tool_name not in self.tools:
-                    raise ValueError(f"Tool {tool_name} not found in configuration")
+        Args:
+            resolved: The resolved toolset to load
 
-                tool_config = self.tools[tool_name]
-                source_name = tool_config.source_name
+        Returns:
+            A tuple of (tools, exit_stack)
+        """
+        toolset_name = resolved.name
 
-                if source_name not in self.sources:
-                    raise ValueError(f"Source {source_name} not found for tool {tool_name}")
+        # Generate a dynamic MCP script
+        script_path = DynamicMySQLMCPGenerator.create_temp_script_file(list(resolved.tools))
 
-                source_config = self.sources[source_name]
-                source_configs.add(source_config.kind)
+        try:
+            tools, exit_stack = await ToolFactory._launch_mysql_mcp(resolved.launch_env, [script_path])
+            logger.info(f"Created dynamic MySQL MCP toolset: {toolset_name} with {len(tools)} tools")
 
-                tool_configs.append(tool_config)
+            return tools, exit_stack
+        except Exception as e:
+            logger.error(f"Error creating dynamic MySQL MCP toolset for {toolset_name}: {e}")
+            raise
 
-            # Skip empty toolsets
-            if not tool_configs:
-                logger.warning(f"Toolset {toolset_name} has no tools, skipping")
-                continue
+# Process-wide loaders, keyed by absolute config file path
+_tool_loaders: Dict[str, ToolLoader] = {}
 
-            # Check if all tools use the same type of source
-            if len(source_configs) != 1:
-                raise ValueError(f"All tools in toolset {toolset_name} must use the same type of source. Found: {source_configs}")
-
-            source_type = next(iter(source_configs))
-
-            # Generate and run the appropriate MCP server based on source type
-            if source_type == 'mysql':
-                # Get the first tool's source config (they all use the same source type)
-                source_name = tool_configs[0].source_name
-                source_config = self.sources[source_name]
-
-                # Generate a dynamic MCP script
-                script_path = DynamicMySQLMCPGenerator.create_temp_script_file(tool_configs)
-                script_paths.append(script_path)
-
-                try:
-                    # Extract source configuration
-                    host = source_config.config.get('host', 'localhost')
-                    port = source_config.config.get('port', 3306)
-                    database = source_config.config.get('database', '')
-                    user = source_config.config.get('user', '')
-                    password = source_config.config.get('password', '')
-
-                    # Create environment variables for the MCP server
-                    env = {
-                        "MYSQL_HOST": host,
-                        "MYSQL_PORT": str(port),
-                        "MYSQL_DATABASE": database,
-                        "MYSQL_USER": user,
-                        "MYSQL_PASSWORD": password,
-                    }
-
-                    # Set up MCP server parameters
-                    server_params = StdioServerParameters(
-                        command="python",
-                        args=[script_path],
-                        env=env
-                    )
-
-                    # Create MCP toolset
-                    tools, exit_stack = await MCPToolset.from_server(connection_params=server_params)
-                    logger.info(f"Created dynamic MySQL MCP toolset: {toolset_name} with {len(tools)} tools")
-
-                    # Register cleanup for the script file when the exit stack is closed
-                    exit_stack.callback(lambda p=script_path: os.unlink(p))
-
-                    all_tools.extend(tools)
-                    all_exit_stacks.append(exit_stack)
-                except Exception as e:
-                    logger.error(f"Error creating dynamic MySQL MCP toolset for {toolset_name}: {e}")
-                    # Clean up the temporary file
-                    try:
-                        os.unlink(script_path)
-                    except Exception:
-                        pass
-                    raise
-            else:
-                raise ValueError(f"Unsupported source type: {source_type} for toolset {toolset_name}")
 
-        return all_tools, all_exit_stacks
+def get_tool_loader(config_file: str) -> ToolLoader:
+    """
+    Return the shared loader for a configuration file, creating it on first use.
+
+    Args:
+        config_file: Path to the YAML configuration file
+
+    Returns:
+        The ToolLoader for that file
+    """
+    config_file = os.path.abspath(config_file)
+    loader = _tool_loaders.get(config_file)
+    if loader is None:
+        loader = _tool_loaders[config_file] = ToolLoader(config_file)
+    return loader
+
@@ -1,28 +1,55 @@
 import asyncio
+import sys
 import time
 
-from dotenv import load_dotenv
 from google.adk.agents import SequentialAgent
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 from google.genai import types
 import warnings
 import logging
+import logging.handlers
+import queue
+import atexit
 from adk.sub_agents.bitbucket_agent import agent as bitbucketAgent
 from adk.sub_agents.elasticsearch_agent import agent as elasticSearchAgent
 from adk.sub_agents.analyzer_agent import agent as analyzerAgent
 from adk.sub_agents.mysql_agent import agent as mysqlAgent
+from adk.sub_agents.docker_images import prefetch_images
+from adk.sub_agents.env import load_env
 
 
 import config
 
 # Ignore all warnings
 warnings.filterwarnings("ignore")
-logging.basicConfig(level=logging.ERROR)
-load_dotenv()
+
+# Log records are queued and written to stderr by a background listener thread
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.basicConfig(level=logging.ERROR, handlers=[logging.handlers.QueueHandler(_log_queue)])
+# Keep the agents' own progress messages visible
+logging.getLogger("adk").setLevel(logging.INFO)
+load_env()
+
+# The query is a constant, so the user message is built once
+_USER_CONTENT = types.Content(role='user', parts=[types.Part(text=config.query)])
+
+
+async def close_exit_stacks(exit_stacks):
+    """Close the MCP servers' exit stacks concurrently, so shutdown waits only for the slowest one."""
+    results = await asyncio.gather(*(exit_stack.aclose() for exit_stack in exit_stacks), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            logging.error(f"Error closing MCP server connection: {result}")
 
 
 async def async_main():
+    # Get the MCP docker images ready in the background while the rest of startup runs
+    prefetch_images(bitbucketAgent.DOCKER_IMAGE, elasticSearchAgent.DOCKER_IMAGE)
+
     session_service = InMemorySessionService()
     session = session_service.create_session(
         state={},
@@ -30,12 +57,31 @@ async def async_main():
         user_id='user_123_session',
     )
 
-    bitbucket_agent, bitbucket_exit_stack = await bitbucketAgent.get_bitbucket_agent_async()
-    elasticsearch_agent, elasticsearch_exit_stack = await elasticSearchAgent.get_elasticsearch_agent_async()
-    analyzer_agent = analyzerAgent.get_analyzer_agent()
-
+    # Start the MCP servers concurrently so startup takes as long as the slowest one.
+    # Each server is owned by its own task in the MCP pool, so the handles returned here
+    # only release a reference and can be closed concurrently from any task.
     # mysql agent not used in this example but its working
-    mysql_agent, mysql_exit_stack = await mysqlAgent.get_mysql_agent_async()
+    results = await asyncio.gather(
+        bitbucketAgent.get_bitbucket_agent_async(),
+        elasticSearchAgent.get_elasticsearch_agent_async(),
+        mysqlAgent.get_mysql_agent_async(),
+        return_exceptions=True,
+    )
+
+    exit_stacks = [result[1] for result in results if not isinstance(result, BaseException)]
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        # Don't leave the servers that did start running
+        await close_exit_stacks(exit_stacks)
+        raise errors[0]
+
+    (
+        (bitbucket_agent, _),
+        (elasticsearch_agent, _),
+        (mysql_agent, _),
+    ) = results
+    analyzer_agent = analyzerAgent.get_analyzer_agent()
 
     try:
         root_agent = SequentialAgent(
@@ -51,29 +97,26 @@ async def async_main():
             session_service=session_service,
         )
 
-        content = types.Content(role='user', parts=[types.Part(text=config.query)])
-        #content = types.Content(role='user', parts=[types.Part(text="return hotel name and create data for id = 1 from Hotel table")])
-
         print("Running agent...")
         start_time = time.time()  #
         events_async = runner.run_async(
             session_id=session.id,
             user_id=session.user_id,
-            new_message=content
+            new_message=_USER_CONTENT
         )
 
         async for event in events_async:
             if event.is_final_response():
-                for p in event.content.parts:
-                    print(f"Event part: {p.text}")
+                # One write for the whole response rather than a print per part
+                sys.stdout.write("".join(p.text for p in event.content.parts if p.text))
+                sys.stdout.write("\n")
+                sys.stdout.flush()
                 elapsed_time = time.time() - start_time
                 print(f"Time taken for agent to return last event: {elapsed_time:.2f} seconds")
 
     finally:
         print("Closing MCP server connection...")
-        await bitbucket_exit_stack.aclose()
-        await elasticsearch_exit_stack.aclose()
-        await mysql_exit_stack.aclose()
+        await close_exit_stacks(exit_stacks)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+# mysql_agent_mcp.py runs as a standalone script and imports its siblings top-level
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "adk", "sub_agents", "mysql_agent"))
+
+try:
+    import aiomysql
+    import mysql_agent_mcp
+    from mysql_agent_mcp import BatchingExecutor
+except ImportError:
+    mysql_agent_mcp = None
+
+
+class FakeCursor:
+    def __init__(self, db, cursor_class):
+        self.db = db
+        self.cursor_class = cursor_class
+        self.description = None
+        self._rows = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, query, args=None):
+        self.db.executed.append((query, args, self.cursor_class))
+        columns, self._rows = self.db.handler(query, args)
+        self.description = [(column,) for column in columns]
+
+    async def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    async def fetchone(self):
+        rows = await self.fetchmany(1)
+        return rows[0] if rows else None
+
+    async def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self.db, cursor_class)
+
+
+class FakePool:
+    """Runs every query through handler(query, args) -> (columns, rows) and records it."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.executed = []
+
+    def acquire(self):
+        return FakeConnection(self)
+
+
+def hotel_names(query, args):
+    """Answer the test statement: the name of each hotel id in args, batched or not."""
+    names = {1: "Alpha", 2: "Beta", 3: "Gamma"}
+    if "UNION ALL" in query:
+        return ["_batch_index", "name"], [(index, names[hotel_id]) for index, hotel_id in enumerate(args)]
+    return ["name"], [(names[args[0]],)]
+
+
+SQL = "SELECT name FROM Hotel WHERE id = %s;"
+
+
+@unittest.skipIf(mysql_agent_mcp is None, "mysql_agent_mcp dependencies are not installed")
+class BatchingExecutorTest(unittest.IsolatedAsyncioTestCase):
+    def use_pool(self, handler):
+        pool = FakePool(handler)
+
+        async def get_mysql_pool():
+            return pool
+
+        patcher = mock.patch.object(mysql_agent_mcp, "get_mysql_pool", get_mysql_pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return pool
+
+    async def test_concurrent_calls_share_one_union_all_query(self):
+        pool = self.use_pool(hotel_names)
+        executor = BatchingExecutor(SQL)
+
+        results = await asyncio.gather(*(executor.execute((hotel_id,)) for hotel_id in (2, 1, 3)))
+
+        self.assertEqual(
+            [json.loads(result) for result in results],
+            [[{"name": "Beta"}], [{"name": "Alpha"}], [{"name": "Gamma"}]],
+        )
+        self.assertEqual(len(pool.executed), 1)
+        query, args, _ = pool.executed[0]
+        self.assertEqual(query.count("UNION ALL"), 2)
+        self.assertIn("SELECT 0 AS _batch_index, _batch.* FROM (SELECT name FROM Hotel WHERE id = %s)", query)
+        self.assertEqual(args, (2, 1, 3))
+
+    async def test_rows_are_routed_by_batch_index(self):
+        def handler(query, args):
+            # Rows of both calls come back interleaved, and the second call matches nothing
+            return ["_batch_index", "name"], [(0, "a"), (2, "c"), (0, "b")]
+
+        self.use_pool(handler)
+        executor = BatchingExecutor(SQL)
+
+        results = await asyncio.gather(*(executor.execute((hotel_id,)) for hotel_id in (1, 2, 3)))
+
+        self.assertEqual(
+            [json.loads(result) for result in results],
+            [[{"name": "a"}, {"name": "b"}], [], [{"name": "c"}]],
+        )
+
+    async def test_lone_call_runs_the_statement_unchanged(self):
+        pool = self.use_pool(hotel_names)
+        executor = BatchingExecutor(SQL)
+
+        result = await executor.execute((1,))
+
+        self.assertEqual(json.loads(result), [{"name": "Alpha"}])
+        self.assertEqual(pool.executed, [("SELECT name FROM Hotel WHERE id = %s", (1,), aiomysql.SSCursor)])
+
+    async def test_rejected_batch_falls_back_and_stops_batching(self):
+        def handler(query, args):
+            if "UNION ALL" in query:
+                raise aiomysql.Error("Duplicate column name 'id'")
+            return hotel_names(query, args)
+
+        pool = self.use_pool(handler)
+        executor = BatchingExecutor(SQL)
+
+        results = await asyncio.gather(executor.execute((1,)), executor.execute((2,)))
+
+        self.assertEqual([json.loads(result) for result in results], [[{"name": "Alpha"}], [{"name": "Beta"}]])
+        self.assertFalse(executor.batchable)
+
+        pool.executed.clear()
+        await asyncio.gather(executor.execute((1,)), executor.execute((3,)))
+        self.assertEqual([query for query, _, _ in pool.executed], [executor.sql, executor.sql])
+
+    async def test_failed_individual_call_only_fails_its_caller(self):
+        def handler(query, args):
+            if "UNION ALL" in query or args == (2,):
+                raise aiomysql.Error("rejected")
+            return hotel_names(query, args)
+
+        self.use_pool(handler)
+        executor = BatchingExecutor(SQL)
+
+        first, second = await asyncio.gather(executor.execute((1,)), executor.execute((2,)), return_exceptions=True)
+
+        self.assertEqual(json.loads(first), [{"name": "Alpha"}])
+        self.assertIsInstance(second, aiomysql.Error)
+
+    async def test_cancelled_caller_does_not_affect_the_rest_of_the_batch(self):
+        self.use_pool(hotel_names)
+        executor = BatchingExecutor(SQL)
+
+        cancelled = asyncio.create_task(executor.execute((1,)))
+        kept = asyncio.create_task(executor.execute((2,)))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        self.assertEqual(json.loads(await kept), [{"name": "Beta"}])
+        with self.assertRaises(asyncio.CancelledError):
+            await cancelled
+
+    def test_only_unordered_selects_are_batched(self):
+        self.assertTrue(BatchingExecutor(SQL).batchable)
+        self.assertFalse(BatchingExecutor("SELECT name FROM Hotel WHERE city = %s ORDER BY name").batchable)
+        self.assertFalse(BatchingExecutor("select name from Hotel order\n  by name").batchable)
+        self.assertFalse(BatchingExecutor("UPDATE Hotel SET name = %s WHERE id = %s").batchable)
+
+
+@unittest.skipIf(mysql_agent_mcp is None, "mysql_agent_mcp dependencies are not installed")
+class FetchResultTest(unittest.IsolatedAsyncioTestCase):
+    async def fetch(self, row_count, max_rows):
+        pool = FakePool(lambda query, args: (["id"], [(i,) for i in range(row_count)]))
+        cursor = pool.acquire().cursor()
+        await cursor.execute("SELECT id FROM t")
+        return json.loads(await mysql_agent_mcp.fetch_result(cursor, max_rows=max_rows))
+
+    async def test_result_within_the_limit_is_a_plain_list(self):
+        self.assertEqual(await self.fetch(3, max_rows=3), [{"id": 0}, {"id": 1}, {"id": 2}])
+        self.assertEqual(len(await self.fetch(2500, max_rows=None)), 2500)
+
+    async def test_capped_result_is_marked_truncated(self):
+        result = await self.fetch(2500, max_rows=1200)
+
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["row_limit"], 1200)
+        self.assertEqual(result["rows"][-1], {"id": 1199})
+        self.assertEqual(len(result["rows"]), 1200)
+
+
+if __name__ == "__main__":
+    unittest.main()
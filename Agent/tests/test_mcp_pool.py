@@ -0,0 +1,121 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    from mcp import StdioServerParameters
+    from adk.tools import mcp_pool
+except ImportError:
+    mcp_pool = None
+
+
+class FakeServer:
+    """Stands in for an MCP server's exit stack, checking it is closed by the task that opened it."""
+
+    def __init__(self):
+        self.task = asyncio.current_task()
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        assert asyncio.current_task() is self.task, "closed from a different task"
+        self.closed = True
+        return False
+
+
+@unittest.skipIf(mcp_pool is None, "google-adk and mcp are not installed")
+class MCPPoolTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.servers = []
+        self.failure = None
+        patcher = mock.patch.object(mcp_pool.MCPToolset, "from_server", self.from_server)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def from_server(self, connection_params):
+        await asyncio.sleep(0)
+        if self.failure is not None:
+            raise self.failure
+        server = FakeServer()
+        self.servers.append(server)
+        return [f"tool:{connection_params.args[0]}"], server
+
+    async def test_callers_with_the_same_parameters_share_one_server(self):
+        params = StdioServerParameters(command="python3", args=["a.py"], env={"X": "1"})
+        (tools_a, handle_a), (tools_b, handle_b) = await asyncio.gather(
+            mcp_pool.acquire_mcp_server(params),
+            mcp_pool.acquire_mcp_server(StdioServerParameters(command="python3", args=["a.py"], env={"X": "1"})),
+        )
+        tools_c, handle_c = await mcp_pool.acquire_mcp_server(
+            StdioServerParameters(command="python3", args=["a.py"], env={"X": "2"})
+        )
+
+        self.assertEqual(len(self.servers), 2)
+        self.assertIs(tools_a, tools_b)
+        self.assertEqual(tools_c, ["tool:a.py"])
+        for handle in (handle_a, handle_b, handle_c):
+            await handle.aclose()
+
+    async def test_server_is_shut_down_with_the_last_reference(self):
+        params = StdioServerParameters(command="python3", args=["a.py"], env={})
+        _, first = await mcp_pool.acquire_mcp_server(params)
+        _, second = await mcp_pool.acquire_mcp_server(params)
+        server = self.servers[0]
+
+        await first.aclose()
+        self.assertFalse(server.closed)
+
+        await second.aclose()
+        self.assertTrue(server.closed)
+        self.assertEqual(mcp_pool._mcp_pool, {})
+        self.assertEqual(mcp_pool._mcp_pool_locks, {})
+
+        # The next caller starts a fresh server
+        _, third = await mcp_pool.acquire_mcp_server(params)
+        self.assertEqual(len(self.servers), 2)
+        await third.aclose()
+
+    async def test_startup_failure_reaches_the_caller(self):
+        self.failure = RuntimeError("server exited")
+        params = StdioServerParameters(command="python3", args=["a.py"], env={})
+
+        with self.assertLogs(mcp_pool.logger, "ERROR"):
+            with self.assertRaisesRegex(RuntimeError, "server exited"):
+                await mcp_pool.acquire_mcp_server(params)
+        self.assertEqual(mcp_pool._mcp_pool, {})
+        self.assertEqual(mcp_pool._mcp_pool_locks, {})
+
+        self.failure = None
+        _, handle = await mcp_pool.acquire_mcp_server(params)
+        await handle.aclose()
+
+    async def test_handle_can_be_closed_from_another_task(self):
+        params = StdioServerParameters(command="python3", args=["a.py"], env={})
+        _, handle = await asyncio.create_task(mcp_pool.acquire_mcp_server(params))
+
+        await asyncio.create_task(handle.aclose())
+
+        self.assertTrue(self.servers[0].closed)
+
+    async def test_cancelled_caller_stops_the_server_it_started(self):
+        params = StdioServerParameters(command="python3", args=["a.py"], env={})
+        caller = asyncio.create_task(mcp_pool.acquire_mcp_server(params))
+        await asyncio.sleep(0)
+        caller.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertTrue(self.servers[0].closed)
+        self.assertEqual(mcp_pool._mcp_pool, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# mysql_agent_mcp.py runs as a standalone script and imports its siblings top-level
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "adk", "sub_agents", "mysql_agent"))
+
+from adk.tools.mysql_tool.models import ToolConfig
+from adk.tools.mysql_tool.mysql_tool_generator import DynamicMySQLMCPGenerator
+
+try:
+    import mysql_agent_mcp
+except ImportError:
+    mysql_agent_mcp = None
+
+TOOL = {
+    "kind": "mysql-sql",
+    "source": "db",
+    "description": "Find rows matching x, y and z.",
+    "parameters": [
+        {"name": "first", "type": "int"},
+        {"name": "second", "type": "str"},
+    ],
+    "statement": "SELECT * FROM t WHERE x = $2 AND y = $1 AND z = $2 AND name LIKE CONCAT('%', $1, '%')",
+}
+
+
+class ToolConfigPlaceholderTest(unittest.TestCase):
+    def test_placeholders_may_be_repeated_and_out_of_order(self):
+        tool = ToolConfig.from_yaml("find", TOOL)
+
+        self.assertEqual(tool.bind_order, (1, 0, 1, 0))
+        self.assertEqual(
+            tool.statement,
+            "SELECT * FROM t WHERE x = %s AND y = %s AND z = %s AND name LIKE CONCAT('%', %s, '%')",
+        )
+
+    def test_placeholder_without_parameter_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, r"\$3"):
+            ToolConfig.from_yaml("find", {**TOOL, "statement": "SELECT * FROM t WHERE x = $3"})
+        with self.assertRaisesRegex(ValueError, r"\$0"):
+            ToolConfig.from_yaml("find", {**TOOL, "statement": "SELECT * FROM t WHERE x = $0"})
+
+    def test_generated_tool_binds_parameters_in_placeholder_order(self):
+        script = DynamicMySQLMCPGenerator.generate_mcp_script([ToolConfig.from_yaml("find", TOOL)])
+
+        self.assertIn("def find(first: int, second: str) -> str:", script)
+        self.assertIn("cursor.execute(query, (second, first, second, first))", script)
+        compile(script, "<generated>", "exec")
+
+
+class FakeMCP:
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self):
+        def register(func):
+            self.tools[func.__name__] = func
+            return func
+        return register
+
+
+class FakeExecutor:
+    def __init__(self, sql):
+        self.sql = sql
+
+    async def execute(self, param_values):
+        return self.sql, param_values
+
+
+@unittest.skipIf(mysql_agent_mcp is None, "mysql_agent_mcp dependencies are not installed")
+class DynamicToolPlaceholderTest(unittest.TestCase):
+    def register(self, config):
+        fake_mcp = FakeMCP()
+        with mock.patch.object(mysql_agent_mcp, "mcp", fake_mcp), \
+                mock.patch.object(mysql_agent_mcp, "BatchingExecutor", FakeExecutor):
+            mysql_agent_mcp.register_dynamic_tool("find", config)
+        return fake_mcp.tools.get("find")
+
+    def test_values_follow_placeholder_order_and_literal_percent_is_escaped(self):
+        tool = self.register(TOOL)
+
+        sql, param_values = asyncio.run(tool(7, "x"))
+
+        self.assertEqual(
+            sql,
+            "SELECT * FROM t WHERE x = %s AND y = %s AND z = %s AND name LIKE CONCAT('%%', %s, '%%')",
+        )
+        self.assertEqual(param_values, ("x", 7, "x", 7))
+        # aiomysql interpolates with the % operator, which must turn %% back into a literal %
+        self.assertEqual(sql % ("'b'", 2, "'b'", 2), "SELECT * FROM t WHERE x = 'b' AND y = 2 AND z = 'b' AND name LIKE CONCAT('%', 2, '%')")
+
+    def test_placeholder_without_parameter_is_not_registered(self):
+        with self.assertLogs(mysql_agent_mcp.logger, "WARNING"):
+            tool = self.register({**TOOL, "statement": "SELECT * FROM t WHERE x = $3"})
+
+        self.assertIsNone(tool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    from adk.tools.mysql_tool import tool_loader
+    from adk.tools.mysql_tool.tool_loader import ToolLoader
+except ImportError:
+    tool_loader = None
+
+CONFIG = """\
+sources:
+  db:
+    kind: mysql
+    host: localhost
+    port: 3306
+tools:
+  by-id:
+    kind: mysql-sql
+    source: db
+    description: Find a row by id.
+    parameters:
+      - name: id
+        type: int
+    statement: SELECT * FROM t WHERE id = $1;
+toolsets:
+  all:
+    - by-id
+"""
+
+
+@unittest.skipIf(tool_loader is None, "google-adk and mcp are not installed")
+class ConfigCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_dir = os.path.join(tmp_dir.name, "cache")
+        self.config_file = os.path.join(tmp_dir.name, "tools.yaml")
+        self.write_config(CONFIG)
+
+        patcher = mock.patch.object(tool_loader, "CACHE_DIR", self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_config(self, text):
+        with open(self.config_file, "w") as f:
+            f.write(text)
+
+    def load(self):
+        """Load the configuration and return whether it had to be parsed."""
+        with mock.patch.object(ToolLoader, "_parse_config", autospec=True, side_effect=ToolLoader._parse_config) as parse:
+            loader = ToolLoader(self.config_file)
+        return loader, parse.called
+
+    def test_unchanged_config_is_loaded_from_the_cache(self):
+        first, parsed = self.load()
+        self.assertTrue(parsed)
+        self.assertEqual(oct(os.stat(self.cache_dir).st_mode & 0o777), oct(0o700))
+
+        second, parsed = self.load()
+        self.assertFalse(parsed)
+        self.assertEqual(second.tools, first.tools)
+        self.assertEqual(second.tools["by-id"].bind_order, (0,))
+        self.assertEqual(list(second.toolsets), ["all"])
+
+    def test_changed_size_misses_the_cache(self):
+        self.load()
+        self.write_config(CONFIG.replace("Find a row by id.", "Find one row by its id."))
+
+        loader, parsed = self.load()
+
+        self.assertTrue(parsed)
+        self.assertEqual(loader.tools["by-id"].description, "Find one row by its id.")
+
+    def test_changed_mtime_misses_the_cache(self):
+        self.load()
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        _, parsed = self.load()
+
+        self.assertTrue(parsed)
+
+    def test_version_bump_misses_the_cache(self):
+        self.load()
+
+        with mock.patch.object(tool_loader, "_CACHE_VERSION", tool_loader._CACHE_VERSION + 1):
+            _, parsed = self.load()
+
+        self.assertTrue(parsed)
+
+    def test_cache_writable_by_others_is_ignored(self):
+        self.load()
+        for name in os.listdir(self.cache_dir):
+            os.chmod(os.path.join(self.cache_dir, name), 0o666)
+
+        with self.assertLogs(tool_loader.logger, "WARNING"):
+            _, parsed = self.load()
+        self.assertTrue(parsed)
+
+        os.chmod(self.cache_dir, 0o777)
+        with self.assertLogs(tool_loader.logger, "WARNING"):
+            _, parsed = self.load()
+        self.assertTrue(parsed)
+
+    def test_corrupt_cache_is_ignored(self):
+        self.load()
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                with open(os.path.join(self.cache_dir, name), "wb") as f:
+                    f.write(b"\x80\x05not a pickle")
+
+        with self.assertLogs(tool_loader.logger, "WARNING"):
+            loader, parsed = self.load()
+        self.assertTrue(parsed)
+        self.assertEqual(list(loader.tools), ["by-id"])
+
+    def read_yaml_calls(self):
+        """Load with a cold pickle cache and return how often the YAML file itself was parsed."""
+        with mock.patch.object(tool_loader, "_CACHE_VERSION", tool_loader._CACHE_VERSION + 1), \
+                mock.patch.object(tool_loader.yaml, "load", side_effect=tool_loader.yaml.load) as load:
+            ToolLoader(self.config_file)
+        return load.call_count
+
+    def test_json_copy_is_kept_in_the_cache_dir_and_matched_exactly(self):
+        self.load()
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.config_file))), ["cache", "tools.yaml"])
+        self.assertTrue(any(name.endswith(".json") for name in os.listdir(self.cache_dir)))
+
+        self.assertEqual(self.read_yaml_calls(), 0)
+
+        # Same mtime as the JSON copy, different size: the copy is stale
+        stat = os.stat(self.config_file)
+        self.write_config(CONFIG.replace("Find a row by id.", "Find one row by its id."))
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.read_yaml_calls(), 1)
+
+        # An older mtime than the JSON copy is a change too
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1_000_000))
+        self.assertEqual(self.read_yaml_calls(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()